@@ -0,0 +1,42 @@
+# $$_ Lines starting with # $$_* autogenerated by jup_mini. Do not modify these
+# $$_code
+# $$_ %%checkall
+'''
+Pure python price kernels and their ahead of time compiled versions, which can be called without jit compiling.
+setup.py builds these into the pyqstrat._price_kernels extension module if numba is installed.  To build them in place run:
+    python pyqstrat/_price_kernels_aot.py
+pq_types builds the numba ufuncs used by PriceArray from the pure python kernels defined here.
+'''
+import math
+import os
+from typing import Any
+
+
+def mid(bid: float, ask: float) -> float:
+    return 0.5 * (bid + ask)
+
+
+def vw_mid(bid: float, ask: float, bid_size: float, ask_size: float) -> float:
+    if bid_size + ask_size == 0: return math.nan
+    return (bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+
+
+def spread(bid: float, ask: float) -> float:
+    if ask < bid: return math.nan
+    return ask - bid
+
+
+def make_cc() -> Any:
+    '''Returns a numba.pycc.CC that compiles the kernels above into the _price_kernels module'''
+    from numba.pycc import CC
+    cc = CC('_price_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('mid', 'f8(f8, f8)')(mid)
+    cc.export('vw_mid', 'f8(f8, f8, f8, f8)')(vw_mid)
+    cc.export('spread', 'f8(f8, f8)')(spread)
+    return cc
+
+
+if __name__ == '__main__':
+    make_cc().compile()
+# $$_end_code
@@ -250,7 +250,8 @@ def _net_trade(stack: deque, trade: Trade) -> RoundTripTrade | None:
     
     entry = stack[0]
     qty = min(abs(entry.qty), abs(trade.qty)) * np.sign(entry.qty)
-    pnl = qty * (trade.price - entry.price) * entry.contract.multiplier - trade.commission - entry.commission
+    scaled_qty = qty * entry.contract.multiplier
+    pnl = scaled_qty * (trade.price - entry.price) - trade.commission - entry.commission
     entry_reason_code = entry.order.reason_code if entry.order else ''
     exit_reason_code = trade.order.reason_code if trade.order else ''
     rt = RoundTripTrade(entry.contract, 
@@ -264,7 +265,9 @@ def _net_trade(stack: deque, trade: Trade) -> RoundTripTrade | None:
                         pnl)
     resid = entry.qty - qty
     entry.qty -= qty
+    entry.scaled_qty -= scaled_qty
     trade.qty += qty
+    trade.scaled_qty += scaled_qty
     if resid == 0:
         stack.popleft()
     return rt
@@ -540,8 +543,8 @@ class Account:
             trade.commission, 
             trade.order.timestamp, 
             trade.order.qty, 
-            trade.order.reason_code, 
-            (str(trade.order.properties.__dict__) if trade.order.properties.__dict__ else ''), 
+            str(trade.order.reason_code), 
+            (str(trade.order.properties.__dict__) if trade.order.properties is not None and trade.order.properties.__dict__ else ''), 
             (str(trade.contract.properties.__dict__) if trade.contract.properties.__dict__ else '')) for trade in trades],
             columns=['symbol', 'timestamp', 'qty', 'price', 'fee', 'commission', 'order_date', 'order_qty',
                      'reason_code', 'order_props', 'contract_props'])
@@ -569,8 +572,8 @@ class Account:
             qty=s.qty,
             entry_price=s.entry_price,
             exit_price=s.exit_price,
-            entry_reason=s.entry_reason,
-            exit_reason=s.exit_reason,
+            entry_reason=str(s.entry_reason),
+            exit_reason=str(s.exit_reason),
             entry_commission=s.entry_commission,
             exit_commission=s.exit_commission,
             net_pnl=s.net_pnl) for s in rt_trades])
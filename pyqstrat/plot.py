@@ -24,8 +24,9 @@ from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  # not directly used but n
 from scipy.interpolate import griddata
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from pyqstrat.pq_utils import series_to_array, has_display, resample_ts, resample_trade_bars, assert_
-from pyqstrat.pq_types import ReasonCode, Trade
+from pyqstrat.pq_types import ReasonCode, Trade, MARKER_PROPERTIES
 from collections.abc import Sequence
+from typing import Any
 
 NAT = np.datetime64('NaT')
 
@@ -896,16 +897,27 @@ class Plot:
         return fig, ax_list
                 
 
-def _group_trades_by_reason_code(trades: Sequence[Trade]) -> dict[str, list[Trade]]:
-    trade_groups: dict[str, list[Trade]] = collections.defaultdict(list)
+def _group_trades_by_reason_code(trades: Sequence[Trade]) -> dict[ReasonCode | str, list[Trade]]:
+    trade_groups: dict[ReasonCode | str, list[Trade]] = collections.defaultdict(list)
     for trade in trades:
-        reason_code = '' if trade.order.reason_code is None else ''
+        reason_code = '' if trade.order.reason_code is None else trade.order.reason_code
+        # Group orders created with the display name of a predefined reason code, e.g. "enter long", with that reason code
+        if isinstance(reason_code, str): reason_code = ReasonCode.from_name(reason_code) or reason_code
         trade_groups[reason_code].append(trade)
     return trade_groups
 
 
+def _get_marker_props(reason_code: ReasonCode | str, marker_props: dict[Any, dict]) -> dict | None:
+    mp = marker_props.get(reason_code)
+    if mp is not None: return mp
+    # Marker properties may be keyed by the reason code's display name and reason codes may be display names, e.g. "enter long"
+    if isinstance(reason_code, ReasonCode): return marker_props.get(str(reason_code))
+    code = ReasonCode.from_name(reason_code)
+    return None if code is None else marker_props.get(code)
+
+
 def trade_sets_by_reason_code(trades: list[Trade], 
-                              marker_props: dict[str, dict] = ReasonCode.MARKER_PROPERTIES, 
+                              marker_props: dict[Any, dict] = MARKER_PROPERTIES, 
                               remove_missing_properties: bool = True) -> list[TradeSet]:
     '''
     Returns a list of TradeSet objects.  Each TradeSet contains trades with a different reason code.  The markers for each TradeSet
@@ -913,22 +925,22 @@ def trade_sets_by_reason_code(trades: list[Trade],
     
     Args:
         trades: We look up reason codes using the reason code on the corresponding orders
-        marker_props: Dictionary from reason code string -> dictionary of marker properties.  
-            See ReasonCode.MARKER_PROPERTIES for example.  Default ReasonCode.MARKER_PROPERTIES
+        marker_props: Dictionary from reason code -> dictionary of marker properties.  Keys can be ReasonCode members or strings.  
+            See MARKER_PROPERTIES for example.  Default MARKER_PROPERTIES
         remove_missing_properties: If set, we remove any reason codes that dont' have marker properties set.
             Default True
      '''
     trade_groups = _group_trades_by_reason_code(trades)
     tradesets = []
     for reason_code, trades in trade_groups.items():
-        if reason_code in marker_props:
-            mp = marker_props[reason_code]
+        mp = _get_marker_props(reason_code, marker_props)
+        if mp is not None:
             disp = ScatterPlotAttributes(marker=mp['symbol'], marker_color=mp['color'], marker_size=mp['size'])
-            tradeset = TradeSet(reason_code, trades, display_attributes=disp)
+            tradeset = TradeSet(str(reason_code), trades, display_attributes=disp)
         elif remove_missing_properties: 
             continue
         else:
-            tradeset = TradeSet(reason_code, trades)
+            tradeset = TradeSet(str(reason_code), trades)
         tradesets.append(tradeset)
     return tradesets 
 
@@ -936,11 +948,11 @@ def trade_sets_by_reason_code(trades: list[Trade],
 def test_plot() -> None:
     
     class MockOrder:
-        def __init__(self, reason_code: str) -> None:
+        def __init__(self, reason_code: ReasonCode | str) -> None:
             self.reason_code = reason_code
     
     class MockTrade:
-        def __init__(self, timestamp: np.datetime64, qty: float, price: float, reason_code: str) -> None:
+        def __init__(self, timestamp: np.datetime64, qty: float, price: float, reason_code: ReasonCode | str) -> None:
             self.timestamp = timestamp
             self.qty = qty
             self.price = price
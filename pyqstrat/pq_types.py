@@ -2,22 +2,51 @@
 # $$_code
 # $$_ %%checkall
 from __future__ import annotations
-import pandas as pd
 import numpy as np
 import types
 import math
 import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Any
-from enum import Enum
+from typing import Any, TYPE_CHECKING
+from enum import Enum, IntEnum
 from pyqstrat.pq_utils import assert_
+from pyqstrat._price_kernels_aot import mid as _mid, vw_mid as _vw_mid, spread as _spread
+if TYPE_CHECKING:
+    import pandas as pd
+
+NAT = np.datetime64('NaT')
+
+
+def _props_dict(properties: SimpleNamespace | None) -> dict[str, Any] | None:
+    return properties.__dict__ if properties is not None else None
+
+
+def _dt_to_pydt(ts: np.datetime64 | datetime.datetime) -> datetime.datetime | None:
+    '''
+    Convert a numpy datetime, python datetime or pandas Timestamp to a python datetime without going through pandas.
+    Python datetimes and pandas Timestamps are returned as is so timezone aware timestamps keep their wall time.
+    Returns None for NaT
+    '''
+    if isinstance(ts, datetime.datetime): return ts
+    return ts.astype('M8[us]').item()
+
+
+def _dt_str(ts: np.datetime64 | datetime.datetime) -> str:
+    '''
+    >>> print(_dt_str(np.datetime64('2023-01-03T09:30')), _dt_str(datetime.datetime(2023, 1, 3, 9, 30)), _dt_str(NAT))
+    2023-01-03 09:30:00 2023-01-03 09:30:00 NaT
+    '''
+    dt = _dt_to_pydt(ts)
+    if dt is None: return 'NaT'
+    return dt.strftime('%Y-%m-%d %H:%M:%S')
 
 
 class ContractGroup:
     '''A way to group contracts for figuring out which indicators, rules and signals to apply to a contract and for PNL reporting'''
 
-    _group_names: set[str] = set()
+    __slots__ = ('name', 'contracts', 'contracts_by_symbol')
+    _groups: dict[str, ContractGroup] = {}
     name: str
     contracts: set[Contract]
     contracts_by_symbol: dict[str, Contract]
@@ -28,7 +57,7 @@ class ContractGroup:
         When running Python interactively you may create a ContractGroup with a given name multiple times because you don't restart Python 
         therefore global variables are not cleared.  This function clears global ContractGroups
         '''
-        ContractGroup._group_names = set()
+        ContractGroup._groups.clear()
         
     @staticmethod
     def create(name) -> ContractGroup:
@@ -36,13 +65,20 @@ class ContractGroup:
          Args:
             name (str): Name of the group
         '''
-        if name in ContractGroup._group_names:
+        if ContractGroup._groups.get(name) is not None:
             raise Exception(f'Contract group: {name} already exists')
-        ContractGroup._group_names.add(name)
         contract_group = ContractGroup()
         contract_group.name = name
         contract_group.contracts = set()
         contract_group.contracts_by_symbol = {}
+        ContractGroup._groups[name] = contract_group
+        return contract_group
+    
+    @staticmethod
+    def get_or_create(name: str) -> ContractGroup:
+        '''Returns the contract group with this name, creating it if it does not exist'''
+        contract_group = ContractGroup._groups.get(name)
+        if contract_group is None: contract_group = ContractGroup.create(name)
         return contract_group
         
     def add_contract(self, contract):
@@ -51,22 +87,48 @@ class ContractGroup:
         
     def get_contract(self, symbol):
         return self.contracts_by_symbol.get(symbol)
+
+    # Contract groups are unique by name, so copies return the same group
+    def __copy__(self) -> ContractGroup:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> ContractGroup:
+        return self
         
     def __repr__(self):
         return self.name
 
 
 class Contract:
-    _symbol_names: set[str] = set()
+    '''
+    A contract such as a stock, option or a future that can be traded.
+    Contracts are unique by symbol, so two contracts are equal only if they are the same object, i.e. 
+    contract1 is contract2 if and only if contract1.symbol == contract2.symbol.  Use Contract.get to look up a contract by symbol.
+    Copying a contract returns the same contract, and unpickling a contract returns the registered contract with that symbol.
+
+    >>> import copy, pickle
+    >>> Contract.clear()
+    >>> ContractGroup.clear()
+    >>> ibm = Contract.create('IBM', ContractGroup.create('IBM'))
+    >>> assert copy.copy(ibm) is ibm and copy.deepcopy([ibm])[0] is ibm
+    >>> assert pickle.loads(pickle.dumps(ibm)) is ibm
+    '''
+    __slots__ = ('symbol', 'expiry', 'multiplier', 'properties', 'contract_group', '_expiry_str', '_mult_str', 'contracts_by_symbol')
+    _contracts: dict[str, Contract] = {}
     symbol: str
     expiry: np.datetime64 | None
     multiplier: float
     properties: SimpleNamespace
     contract_group: ContractGroup
+    _expiry_str: str
+    _mult_str: str
         
     contracts_by_symbol: dict[str, Contract]
 
-    '''A contract such as a stock, option or a future that can be traded'''
+    # Contracts are interned by symbol in create, so identity comparison and hashing are sufficient
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
     @staticmethod
     def create(symbol: str, 
                contract_group: ContractGroup, 
@@ -86,11 +148,17 @@ class Contract:
                 so multiplier would be 50.  Default 1
             properties: Any data you want to store with this contract.
                 For example, you may want to store option strike.  Default None
+
+        >>> Contract.clear()
+        >>> ContractGroup.clear()
+        >>> print(Contract.create('ESH9', ContractGroup.create('ES'), expiry=np.datetime64('2019-03-15T09:30'), multiplier=50))
+        ESH9 50 expiry: 2019-03-15 09:30:00 group: ES
+        >>> print(Contract.create('ESM9', ContractGroup.get_or_create('ES'), expiry=np.datetime64('NaT'), multiplier=50))
+        ESM9 50 expiry: NaT group: ES
         '''
         assert_(isinstance(symbol, str) and len(symbol) > 0)
-        if symbol in Contract._symbol_names:
+        if Contract._contracts.get(symbol) is not None:
             raise Exception(f'Contract with symbol: {symbol} already exists')
-        Contract._symbol_names.add(symbol)
 
         assert_(multiplier > 0)
 
@@ -104,6 +172,9 @@ class Contract:
             
         contract.expiry = expiry
         contract.multiplier = multiplier
+        # Precompute strings used in __repr__ since it is called frequently when logging orders and trades.  _dt_str handles NaT
+        contract._expiry_str = '' if expiry is None else f' expiry: {_dt_str(expiry)}'
+        contract._mult_str = '' if multiplier == 1 else f' {multiplier}'
         
         if properties is None:
             properties = types.SimpleNamespace()
@@ -111,24 +182,100 @@ class Contract:
         
         contract_group.add_contract(contract)
         contract.contract_group = contract_group
+        Contract._contracts[symbol] = contract
         return contract
     
+    @staticmethod
+    def get_or_create(symbol: str, 
+                      contract_group: ContractGroup, 
+                      expiry: np.datetime64 | datetime.datetime | None = None, 
+                      multiplier: float = 1., 
+                      properties: SimpleNamespace | None = None) -> Contract:
+        '''
+        Returns the contract with this symbol if it exists.  Otherwise creates it.  See create for arguments.
+        If the contract exists, contract_group, expiry and multiplier must match the existing contract or we raise an exception.
+        properties are ignored for an existing contract.
+        
+        >>> Contract.clear()
+        >>> ContractGroup.clear()
+        >>> ibm = Contract.get_or_create('IBM', ContractGroup.get_or_create('IBM'))
+        >>> assert Contract.get_or_create('IBM', ContractGroup.get_or_create('IBM')) is ibm
+        >>> Contract.get_or_create('IBM', ContractGroup.get_or_create('IBM'), multiplier=100)
+        Traceback (most recent call last):
+        ...
+        pyqstrat.pq_utils.PQException: Contract IBM already exists with multiplier: 1.0 contract group: IBM expiry: None
+        '''
+        contract = Contract._contracts.get(symbol)
+        if contract is None: return Contract.create(symbol, contract_group, expiry, multiplier, properties)
+        if expiry is not None and isinstance(expiry, datetime.datetime): expiry = np.datetime64(expiry)
+        same_expiry = (expiry is None and contract.expiry is None) or (
+            expiry is not None and contract.expiry is not None and (expiry == contract.expiry or (np.isnat(expiry) and np.isnat(contract.expiry))))
+        assert_(contract.contract_group is contract_group and contract.multiplier == multiplier and same_expiry,
+                f'Contract {symbol} already exists with multiplier: {contract.multiplier} contract group: {contract.contract_group} '
+                f'expiry: {contract.expiry}')
+        return contract
+    
+    @staticmethod
+    def get(symbol: str) -> Contract | None:
+        '''
+        Returns the contract with this symbol or None if it does not exist
+
+        >>> Contract.clear()
+        >>> ContractGroup.clear()
+        >>> ibm = Contract.create('IBM', ContractGroup.create('IBM'))
+        >>> assert Contract.get('IBM') is ibm and Contract.get('MSFT') is None
+        '''
+        return Contract._contracts.get(symbol)
+    
     @staticmethod
     def clear() -> None:
         '''
         When running Python interactively you may create a Contract with a given symbol multiple times because you don't restart Python 
         therefore global variables are not cleared.  This function clears global Contracts
         '''
-        Contract._symbol_names = set()
+        Contract._contracts.clear()
+        
+    def __copy__(self) -> Contract:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Contract:
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _unpickle_contract, (self.symbol, self.contract_group.name, self.expiry, self.multiplier, self.properties)
         
     def __repr__(self) -> str:
-        return f'{self.symbol}' + (f' {self.multiplier}' if self.multiplier != 1 else '') + (
-            f' expiry: {self.expiry.astype(datetime.datetime):%Y-%m-%d %H:%M:%S}' if self.expiry is not None else '') + (
-            f' group: {self.contract_group.name}' if self.contract_group else '') + (
-            f' {self.properties.__dict__}' if self.properties.__dict__ else '')
+        group = f' group: {self.contract_group.name}' if self.contract_group else ''
+        properties = f' {self.properties.__dict__}' if self.properties.__dict__ else ''
+        return f'{self.symbol}{self._mult_str}{self._expiry_str}{group}{properties}'
+
+
+def _unpickle_contract(symbol: str, 
+                       contract_group_name: str, 
+                       expiry: np.datetime64 | None, 
+                       multiplier: float, 
+                       properties: SimpleNamespace) -> Contract:
+    '''
+    Returns the registered contract with this symbol, creating it if it was pickled in another process.
+    Raises if the registered contract does not match the pickled one
+    '''
+    return Contract.get_or_create(symbol, ContractGroup.get_or_create(contract_group_name), expiry, multiplier, properties)
     
 
-@dataclass
+# If numba is installed, build ufuncs from the price kernels for PriceArray.  The scalar Price methods don't use numba since
+# calling a compiled function from the interpreter costs more than the arithmetic it replaces.  Sizes are passed as float64 so that both int and float sizes
+# match the signature.  We don't use fastmath since these kernels return nan for missing quotes
+try:
+    from numba import vectorize
+    _mid_ufunc = vectorize(['float64(float64, float64)'], cache=True)(_mid)
+    _vw_mid_ufunc = vectorize(['float64(float64, float64, float64, float64)'], cache=True)(_vw_mid)
+    _spread_ufunc = vectorize(['float64(float64, float64)'], cache=True)(_spread)
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+@dataclass(slots=True)
 class Price:
     '''
     >>> price = Price(datetime.datetime(2020, 1, 1), 15.25, 15.75, 189, 300)
@@ -140,6 +287,12 @@ class Price:
     15.25@189/15.75@300 delta: -0.3 invalid
     >>> print(price.mid())
     15.5
+    >>> price.set_property('gamma', 0.0123456)
+    >>> print(price)
+    15.25@189/15.75@300 delta: -0.3 gamma: 0.012346 invalid
+    >>> price.properties.delta = -0.25
+    >>> print(price)
+    15.25@189/15.75@300 delta: -0.25 gamma: 0.012346 invalid
     '''
     timestamp: datetime.datetime
     bid: float
@@ -151,12 +304,18 @@ class Price:
         
     @staticmethod
     def invalid() -> Price:
-        return Price(datetime.datetime(datetime.MINYEAR, 1, 1),
-                     bid=math.nan, 
-                     ask=math.nan, 
-                     bid_size=-1, 
-                     ask_size=-1, 
-                     valid=False)
+        '''
+        Returns a shared Price used to indicate a missing quote.  Callers must not modify the returned object.
+
+        >>> assert Price.invalid() is Price.invalid() and Price.is_invalid(Price.invalid())
+        >>> assert not Price.is_invalid(Price(datetime.datetime(2020, 1, 1), 15.25, 15.75, 189, 300))
+        '''
+        return _INVALID_PRICE
+    
+    @staticmethod
+    def is_invalid(price: Price) -> bool:
+        '''True if price is the shared invalid price or is marked invalid'''
+        return price is _INVALID_PRICE or not price.valid
         
     def mid(self) -> float:
         return 0.5 * (self.bid + self.ask)
@@ -184,16 +343,123 @@ class Price:
         return self.ask - self.bid
         
     def __repr__(self) -> str:
-        msg = f'{self.bid:.2f}@{self.bid_size}/{self.ask:.2f}@{self.ask_size}'
-        if self.properties:
-            for k, v in self.properties.__dict__.items():
-                if isinstance(v, (np.floating, float)):
-                    msg += f' {k}: {v:.5g}'
-                else:
-                    msg += f' {k}: {v}'
+        msg = f'{self.bid:.2f}@{self.bid_size}/{self.ask:.2f}@{self.ask_size}{self._properties_repr()}'
         if not self.valid:
             msg += ' invalid'
         return msg
+    
+    def _properties_repr(self) -> str:
+        if self.properties is None: return ''
+        return ''.join([f' {k}: {v:.5g}' if isinstance(v, (np.floating, float)) else f' {k}: {v}' 
+                        for k, v in self.properties.__dict__.items()])
+
+    @staticmethod
+    def to_array(prices: list[Price]) -> PriceArray:
+        '''Convert a list of Price objects to a PriceArray'''
+        return PriceArray.from_prices(prices)
+
+
+_INVALID_PRICE = Price(datetime.datetime(datetime.MINYEAR, 1, 1), 
+                       bid=math.nan, 
+                       ask=math.nan, 
+                       bid_size=-1, 
+                       ask_size=-1, 
+                       valid=False)
+
+
+class PriceArray:
+    '''
+    Columnar storage for a sequence of quotes.  Each field of Price is stored as a numpy array so that
+    mid, vw_mid and spread can be computed for all quotes at once instead of one Price object at a time.
+    Properties are not stored.
+
+    >>> prices = PriceArray(np.array(['2020-01-01T09:30', '2020-01-01T09:31'], dtype='M8[ns]'),
+    ...                     [15.25, 10.], [15.75, 9.5], [189, 0], [300, 0])
+    >>> print(prices.mid())
+    [15.5   9.75]
+    >>> print(prices.spread())
+    [0.5 nan]
+    >>> print(np.round(prices.vw_mid(), 4))
+    [15.4433     nan]
+    >>> print(len(prices), prices.valid)
+    2 [ True  True]
+    '''
+    def __init__(self,
+                 timestamp: np.ndarray,
+                 bid: np.ndarray,
+                 ask: np.ndarray,
+                 bid_size: np.ndarray,
+                 ask_size: np.ndarray,
+                 valid: np.ndarray | None = None) -> None:
+        '''
+        Args:
+            timestamp: Quote times
+            bid: Bid prices
+            ask: Ask prices
+            bid_size: Bid sizes
+            ask_size: Ask sizes
+            valid: Whether each quote is valid.  If not set, all quotes are valid.  Default None
+        '''
+        self.timestamp = np.asarray(timestamp, dtype='M8[ns]')
+        self.bid = np.asarray(bid, dtype=np.float64)
+        self.ask = np.asarray(ask, dtype=np.float64)
+        self.bid_size = np.asarray(bid_size, dtype=np.int64)
+        self.ask_size = np.asarray(ask_size, dtype=np.int64)
+        if valid is None:
+            self.valid = np.ones(len(self.bid), dtype=bool)
+        else:
+            self.valid = np.asarray(valid, dtype=bool)
+        assert_(len(self.timestamp) == len(self.bid) == len(self.ask) == len(self.bid_size) == len(self.ask_size) == len(self.valid),
+                'all PriceArray columns must have the same length')
+
+    @staticmethod
+    def from_prices(prices: list[Price]) -> PriceArray:
+        '''
+        Timestamps of invalid prices are set to NaT since they may be out of the range of datetime64[ns]
+
+        >>> prices = [Price(datetime.datetime(2020, 1, 1), 15.25, 15.75, 189, 300), Price.invalid()]
+        >>> price_array = PriceArray.from_prices(prices)
+        >>> print(price_array.bid, price_array.valid)
+        [15.25   nan] [ True False]
+        '''
+        return PriceArray(np.array([p.timestamp if p.valid else NAT for p in prices], dtype='M8[ns]'),
+                          np.array([p.bid for p in prices], dtype=np.float64),
+                          np.array([p.ask for p in prices], dtype=np.float64),
+                          np.array([p.bid_size for p in prices], dtype=np.int64),
+                          np.array([p.ask_size for p in prices], dtype=np.int64),
+                          np.array([p.valid for p in prices], dtype=bool))
+
+    def __len__(self) -> int:
+        return len(self.bid)
+
+    def mid(self) -> np.ndarray:
+        if _HAS_NUMBA: return _mid_ufunc(self.bid, self.ask)
+        return 0.5 * (self.bid + self.ask)
+
+    def vw_mid(self) -> np.ndarray:
+        '''
+        Volume weighted mid.  nan where both bid and ask sizes are 0
+
+        >>> import warnings
+        >>> n = 100
+        >>> sizes = np.where(np.arange(n) % 2 == 0, 0, 100)
+        >>> prices = PriceArray(np.full(n, np.datetime64('2020-01-01T09:30'), dtype='M8[ns]'), np.full(n, 10.), np.full(n, 10.5), sizes, sizes)
+        >>> with warnings.catch_warnings():
+        ...     warnings.simplefilter('error')
+        ...     vw_mid = prices.vw_mid()
+        >>> print(vw_mid[:4])
+        [  nan 10.25   nan 10.25]
+        '''
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if _HAS_NUMBA: return _vw_mid_ufunc(self.bid, self.ask, self.bid_size, self.ask_size)
+            num = self.bid * self.ask_size + self.ask * self.bid_size
+            den = self.bid_size + self.ask_size
+            return np.where(den == 0, np.nan, num / den)
+
+    def spread(self) -> np.ndarray:
+        '''ask - bid.  nan where the market is crossed'''
+        if _HAS_NUMBA: return _spread_ufunc(self.bid, self.ask)
+        return np.where(self.ask < self.bid, np.nan, self.ask - self.bid)
 
 
 class OrderStatus(Enum):
@@ -205,30 +471,80 @@ class OrderStatus(Enum):
     FILLED = 3
     CANCEL_REQUESTED = 4
     CANCELLED = 5
+
+
+# Order quantities smaller than this in absolute value are treated as 0
+_QTY_EPS = 1e-12
+
+
+def _valid_qty(qty: float) -> bool:
+    '''True if qty is finite and nonzero.  Uses math instead of numpy since this is called for every order'''
+    return math.isfinite(qty) and abs(qty) >= _QTY_EPS
+
+
+_OPEN_STATUSES: frozenset[OrderStatus] = frozenset((OrderStatus.OPEN, OrderStatus.CANCEL_REQUESTED, OrderStatus.PARTIALLY_FILLED))
+_FILLABLE_STATUSES: frozenset[OrderStatus] = frozenset((OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED))
     
 
-class ReasonCode:
-    '''A class containing constants for predefined order reason codes. Prefer these predefined reason codes if they suit
+class _MarkerProperties:
+    '''Exposes MARKER_PROPERTIES as ReasonCode.MARKER_PROPERTIES.  Enum does not turn descriptors into members'''
+    def __get__(self, obj: Any, objtype: Any = None) -> dict[ReasonCode, dict[str, Any]]:
+        return MARKER_PROPERTIES
+
+
+class ReasonCode(IntEnum):
+    '''Predefined order reason codes. Prefer these predefined reason codes if they suit
     the reason you are creating your order.  Otherwise, use your own string.
+    str() of a reason code returns its display name, e.g. "enter long".  Values start at 1 so all reason codes are truthy.
+
+    >>> print(ReasonCode.ENTER_LONG, ReasonCode.marker(ReasonCode.ENTER_LONG))
+    enter long ('P', 'blue', 50)
+    >>> assert ReasonCode.from_name('enter long') is ReasonCode.ENTER_LONG and ReasonCode.from_name('stop loss') is None
     '''
-    ENTER_LONG = 'enter long'
-    ENTER_SHORT = 'enter short'
-    EXIT_LONG = 'exit long'
-    EXIT_SHORT = 'exit short'
-    BACKTEST_END = 'backtest end'
-    ROLL_FUTURE = 'roll future'
-    NONE = 'none'
-    
-    # Used for plotting trades
-    MARKER_PROPERTIES = {
-        ENTER_LONG: {'symbol': 'P', 'color': 'blue', 'size': 50},
-        ENTER_SHORT: {'symbol': 'P', 'color': 'red', 'size': 50},
-        EXIT_LONG: {'symbol': 'X', 'color': 'blue', 'size': 50},
-        EXIT_SHORT: {'symbol': 'X', 'color': 'red', 'size': 50},
-        ROLL_FUTURE: {'symbol': '>', 'color': 'green', 'size': 50},
-        BACKTEST_END: {'symbol': '*', 'color': 'green', 'size': 50},
-        NONE: {'symbol': 'o', 'color': 'green', 'size': 50}
-    }
+    ENTER_LONG = 1
+    ENTER_SHORT = 2
+    EXIT_LONG = 3
+    EXIT_SHORT = 4
+    BACKTEST_END = 5
+    ROLL_FUTURE = 6
+    NONE = 7
+
+    MARKER_PROPERTIES = _MarkerProperties()
+
+    def __str__(self) -> str:
+        return _REASON_CODE_NAMES[self - 1]
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def marker(self) -> tuple[str, str, int]:
+        '''Returns marker symbol, color and size used for plotting trades with this reason code'''
+        return _MARKER_TABLE[self - 1]
+
+    @staticmethod
+    def from_name(name: str) -> ReasonCode | None:
+        '''Returns the reason code with this display name, e.g. "enter long", or None if there is no such reason code'''
+        return _REASON_CODES_BY_NAME.get(name)
+
+
+# Indexed by ReasonCode value - 1
+_REASON_CODE_NAMES: tuple[str, ...] = ('enter long', 'enter short', 'exit long', 'exit short', 'backtest end', 'roll future', 'none')
+
+_REASON_CODES_BY_NAME: dict[str, ReasonCode] = {name: ReasonCode(i + 1) for i, name in enumerate(_REASON_CODE_NAMES)}
+
+# Used for plotting trades.  Indexed by ReasonCode value - 1
+_MARKER_TABLE: tuple[tuple[str, str, int], ...] = (
+    ('P', 'blue', 50),
+    ('P', 'red', 50),
+    ('X', 'blue', 50),
+    ('X', 'red', 50),
+    ('*', 'green', 50),
+    ('>', 'green', 50),
+    ('o', 'green', 50))
+
+# Reason code -> marker properties, for passing to plotting functions that take a dictionary of marker properties
+MARKER_PROPERTIES: dict[ReasonCode, dict[str, Any]] = {
+    code: {'symbol': symbol, 'color': color, 'size': size} for code, (symbol, color, size) in zip(ReasonCode, _MARKER_TABLE)}
     
 
 # class syntax
@@ -238,7 +554,7 @@ class TimeInForce(Enum):
     DAY = 3  # Cancel at EOD
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Order:
     '''
     Args:
@@ -248,89 +564,114 @@ class Order:
         reason_code: The reason this order was created.
             Prefer a predefined constant from the ReasonCode class if it matches your reason for creating this order.
             Default None
-        properties: Any order specific data we want to store.  Default None
+        properties: Any order specific data we want to store.  Use set_property to add properties to an order. Default None
         status: Status of the order, "open", "filled", etc. Default "open"
     '''
     contract: Contract
     timestamp: np.datetime64
     qty: float = math.nan
-    reason_code: str = ReasonCode.NONE
+    reason_code: ReasonCode | str = ReasonCode.NONE
     time_in_force: TimeInForce = TimeInForce.FOK
-    properties: SimpleNamespace = field(default_factory=SimpleNamespace)
+    properties: SimpleNamespace | None = None
     status: OrderStatus = OrderStatus.OPEN
         
     def is_open(self) -> bool:
-        return self.status in [OrderStatus.OPEN, OrderStatus.CANCEL_REQUESTED, OrderStatus.PARTIALLY_FILLED]
+        return self.status in _OPEN_STATUSES
     
+    def set_property(self, name: str, value: Any) -> None:
+        if self.properties is None:
+            self.properties = SimpleNamespace()
+        setattr(self.properties, name, value)
+        
     def request_cancel(self) -> None:
         self.status = OrderStatus.CANCEL_REQUESTED
         
     def fill(self, fill_qty: float = math.nan) -> None:
-        assert_(self.status in [OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED], 
+        '''
+        Fill the order.  If fill_qty is not set, fill the entire remaining qty.  The order is filled once the 
+        remaining qty is within _QTY_EPS of 0, so floating point residuals don't leave it partially filled.
+
+        >>> order = MarketOrder(contract=None, timestamp=np.datetime64('2023-01-03T09:30'), qty=1.)
+        >>> order.fill(0.7)
+        >>> print(order.status)
+        OrderStatus.PARTIALLY_FILLED
+        >>> order.fill(0.3)
+        >>> print(order.status, order.qty)
+        OrderStatus.FILLED 0.0
+        >>> order = MarketOrder(contract=None, timestamp=np.datetime64('2023-01-03T09:30'), qty=0.3)
+        >>> order.fill(0.1)
+        >>> order.fill(0.2)
+        >>> print(order.status, order.qty)
+        OrderStatus.FILLED 0.0
+        '''
+        assert_(self.status in _FILLABLE_STATUSES, 
                 f'cannot fill an order in status: {self.status}')
         if math.isnan(fill_qty): fill_qty = self.qty
         assert_(self.qty * fill_qty >= 0, f'order qty: {self.qty} cannot be opposite sign of {fill_qty}')
-        assert_(abs(fill_qty) <= abs(self.qty), f'cannot fill qty: {fill_qty} larger than order qty: {self.qty}')
+        assert_(abs(fill_qty) <= abs(self.qty) + _QTY_EPS, f'cannot fill qty: {fill_qty} larger than order qty: {self.qty}')
         self.qty -= fill_qty
-        if math.isclose(self.qty, 0):
+        if abs(self.qty) < _QTY_EPS:
+            self.qty = 0.
             self.status = OrderStatus.FILLED
         else:
             self.status = OrderStatus.PARTIALLY_FILLED
         
     def cancel(self) -> None:
         self.status = OrderStatus.CANCELLED
+
+    def _repr(self, details: str) -> str:
+        '''Repr shared by order subclasses.  details contains fields specific to the order type'''
+        parts = [self.contract.symbol if self.contract else '', ' ', _dt_str(self.timestamp), details]
+        if self.reason_code is not ReasonCode.NONE: parts.append(f' {self.reason_code}')
+        if _props_dict(self.properties): parts.append(f' {self.properties}')
+        parts.append(f' {self.status}')
+        return ''.join(parts)
         
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class MarketOrder(Order):
     def __post_init__(self):
-        if not np.isfinite(self.qty) or math.isclose(self.qty, 0):
+        if not _valid_qty(self.qty):
             raise ValueError(f'order qty must be finite and nonzero: {self.qty}')
             
-    def __repr__(self):
-        timestamp = pd.Timestamp(self.timestamp).to_pydatetime()
-        return f'{self.contract.symbol} {timestamp:%Y-%m-%d %H:%M:%S} qty: {self.qty}' + (
-            '' if self.reason_code == ReasonCode.NONE else f' {self.reason_code}') + (
-            '' if not self.properties.__dict__ else f' {self.properties}') + (
-            f' {self.status}')
+    def __repr__(self) -> str:
+        return self._repr(f' qty: {self.qty}')
             
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class LimitOrder(Order):
     limit_price: float
         
     def __post_init__(self) -> None:
-        if not np.isfinite(self.qty) or math.isclose(self.qty, 0):
+        if not _valid_qty(self.qty):
             raise ValueError(f'order qty must be finite and nonzero: {self.qty}')
             
     def __repr__(self) -> str:
-        timestamp = pd.Timestamp(self.timestamp).to_pydatetime()
-        symbol = self.contract.symbol if self.contract else ''
-        return f'{symbol} {timestamp:%Y-%m-%d %H:%M:%S} qty: {self.qty} lmt_prc: {self.limit_price}' + (
-            '' if self.reason_code == ReasonCode.NONE else f' {self.reason_code}') + (
-            '' if not self.properties.__dict__ else f' {self.properties}') + (
-            f' {self.status}')
+        return self._repr(f' qty: {self.qty} lmt_prc: {self.limit_price}')
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class RollOrder(Order):
     close_qty: float
     reopen_qty: float
 
     def __post_init__(self) -> None:
-        if not np.isfinite(self.close_qty) or math.isclose(self.close_qty, 0) \
-                or not np.isfinite(self.reopen_qty) or math.isclose(self.reopen_qty, 0):
+        if not (_valid_qty(self.close_qty) and _valid_qty(self.reopen_qty)):
             raise ValueError(f'order quantities must be non-zero and finite: {self.close_qty} {self.reopen_qty}')
             
     def __repr__(self) -> str:
-        timestamp = pd.Timestamp(self.timestamp).to_pydatetime()
-        symbol = self.contract.symbol if self.contract else ''
-        return f'{symbol} {timestamp:%Y-%m-%d %H:%M:%S} close_qty: {self.close_qty} reopen_qty: {self.reopen_qty}' + (
-            '' if self.reason_code == ReasonCode.NONE else f' {self.reason_code}') + '' if not self.properties.__dict__ else f' {self.properties}' + (
-            f' {self.status}')
+        '''
+        >>> Contract.clear()
+        >>> ContractGroup.clear()
+        >>> contract = Contract.create('ESH3', contract_group=ContractGroup.create('ES'))
+        >>> print(RollOrder(contract=contract, timestamp=np.datetime64('2023-03-10T15:00'), close_qty=-2, reopen_qty=2,
+        ...       reason_code=ReasonCode.ROLL_FUTURE))
+        ESH3 2023-03-10 15:00:00 close_qty: -2 reopen_qty: 2 roll future OrderStatus.OPEN
+        '''
+        return self._repr(f' close_qty: {self.close_qty} reopen_qty: {self.reopen_qty}')
             
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class StopLimitOrder(Order):
     '''Used for stop loss or stop limit orders.  The order is triggered when price goes above or below trigger price, depending on whether this is a short
       or long order.  Becomes either a market or limit order at that point, depending on whether you set the limit price or not.
@@ -344,18 +685,88 @@ class StopLimitOrder(Order):
     triggered: bool = False
     
     def __post_init__(self) -> None:
-        if not np.isfinite(self.qty) or math.isclose(self.qty, 0):
+        if not _valid_qty(self.qty):
             raise ValueError(f'order qty must be finite and nonzero: {self.qty}')
     
     def __repr__(self) -> str:
-        timestamp = pd.Timestamp(self.timestamp).to_pydatetime()
-        symbol = self.contract.symbol if self.contract else ''
-        return f'{symbol} {timestamp:%Y-%m-%d %H:%M:%S} qty: {self.qty} trigger_prc: {self.trigger_price} limit_prc: {self.limit_price}' + (
-            '' if self.reason_code == ReasonCode.NONE else f' {self.reason_code}') + ('' if not self.properties.__dict__ else f' {self.properties}') + (
-            f' {self.status}')
+        return self._repr(f' qty: {self.qty} trigger_prc: {self.trigger_price} limit_prc: {self.limit_price}')
+            
+
+class OrderQueue:
+    '''
+    Orders sorted by timestamp.  Timestamps are stored in a datetime64[ns] array so orders within a time range 
+    are found using np.searchsorted instead of checking each order.  Orders added since the last lookup are sorted
+    and inserted into the existing sorted orders, so adding a few orders per bar costs a linear copy rather than a full sort.
+    Call remove_closed to drop filled and cancelled orders.
+
+    >>> Contract.clear()
+    >>> ContractGroup.clear()
+    >>> contract = Contract.create('IBM', contract_group=ContractGroup.create('IBM'))
+    >>> queue = OrderQueue()
+    >>> queue.add(MarketOrder(contract=contract, timestamp=np.datetime64('2023-01-03T09:32'), qty=10))
+    >>> queue.add(MarketOrder(contract=contract, timestamp=np.datetime64('2023-01-03T09:30'), qty=20))
+    >>> print([order.qty for order in queue.between()])
+    [20, 10]
+    >>> queue.add(MarketOrder(contract=contract, timestamp=np.datetime64('2023-01-03T09:35'), qty=30))
+    >>> queue.add(MarketOrder(contract=contract, timestamp=np.datetime64('2023-01-03T09:31'), qty=40))
+    >>> print([order.qty for order in queue.between(np.datetime64('2023-01-03T09:30'), np.datetime64('2023-01-03T09:32'))])
+    [20, 40, 10]
+    >>> print(len(queue), [order.qty for order in queue.between(start=np.datetime64('2023-01-03T09:31'))])
+    4 [40, 10, 30]
+    >>> queue.between()[0].fill()
+    >>> queue.remove_closed()
+    >>> print(len(queue), [order.qty for order in queue.between()])
+    3 [40, 10, 30]
+    '''
+    def __init__(self) -> None:
+        self._orders = np.empty(0, dtype=object)
+        self._timestamps = np.empty(0, dtype='M8[ns]')
+        # Orders added since the last lookup.  These are merged into the sorted orders when needed
+        self._pending: list[Order] = []
+
+    def add(self, order: Order) -> None:
+        self._pending.append(order)
+
+    def __len__(self) -> int:
+        return len(self._orders) + len(self._pending)
+
+    def _merge_pending(self) -> None:
+        if not self._pending: return
+        timestamps = np.array([order.timestamp for order in self._pending], dtype='M8[ns]')
+        indices = np.argsort(timestamps, kind='stable')
+        orders = np.empty(len(self._pending), dtype=object)
+        orders[:] = self._pending
+        # side='right' keeps orders with equal timestamps in the order they were added
+        positions = np.searchsorted(self._timestamps, timestamps[indices], side='right')
+        self._timestamps = np.insert(self._timestamps, positions, timestamps[indices])
+        self._orders = np.insert(self._orders, positions, orders[indices])
+        self._pending = []
+
+    def between(self, start: np.datetime64 = NAT, end: np.datetime64 = NAT) -> list[Order]:
+        '''
+        Returns orders with timestamp between (and including) start and end, sorted by timestamp
+
+        Args:
+            start: If NaT (default) there is no lower bound
+            end: If NaT (default) there is no upper bound
+        '''
+        self._merge_pending()
+        start_idx = 0 if np.isnat(start) else int(np.searchsorted(self._timestamps, start, side='left'))
+        end_idx = len(self._orders) if np.isnat(end) else int(np.searchsorted(self._timestamps, end, side='right'))
+        return list(self._orders[start_idx:end_idx])
+
+    def remove_closed(self) -> None:
+        '''Removes orders that are no longer open, i.e. filled or cancelled'''
+        self._merge_pending()
+        is_open = np.array([order.is_open() for order in self._orders], dtype=bool)
+        if is_open.all(): return
+        self._orders = self._orders[is_open]
+        self._timestamps = self._timestamps[is_open]
             
 
 class Trade:
+    __slots__ = ('contract', 'order', 'timestamp', 'qty', 'price', 'fee', 'commission', 'properties', 'scaled_qty')
+
     def __init__(self, contract: Contract,
                  order: Order,
                  timestamp: np.datetime64, 
@@ -378,10 +789,10 @@ class Trade:
         '''
         # assert(isinstance(contract, Contract))
         # assert(isinstance(order, Order))
-        assert_(np.isfinite(qty))
-        assert_(np.isfinite(price))
-        assert_(np.isfinite(fee))
-        assert_(np.isfinite(commission))
+        assert_(math.isfinite(qty))
+        assert_(math.isfinite(price))
+        assert_(math.isfinite(fee))
+        assert_(math.isfinite(commission))
         # assert(isinstance(timestamp, np.datetime64))
         
         self.contract = contract
@@ -391,6 +802,8 @@ class Trade:
         self.price = price
         self.fee = fee
         self.commission = commission
+        # qty * contract multiplier so pnl calculations don't have to look up the multiplier for each trade
+        self.scaled_qty = qty * contract.multiplier
         
         if properties is None:
             properties = types.SimpleNamespace()
@@ -405,32 +818,243 @@ class Trade:
         >>> print(Trade(contract, order, np.datetime64('2019-01-01 15:00'), 100, 10.2130000, 0.01))
         IBM 2019-01-01 15:00:00 qty: 100 prc: 10.213 fee: 0.01 order: IBM 2019-01-01 14:59:00 qty: 100 OrderStatus.OPEN
         '''
-        timestamp = pd.Timestamp(self.timestamp).to_pydatetime()
+        timestamp = _dt_str(self.timestamp)
         fee = f' fee: {self.fee:.6g}' if self.fee else ''
         commission = f' commission: {self.commission:.6g}' if self.commission else ''
         return f'{self.contract.symbol}' + (
             f' {self.contract.properties.__dict__}' if self.contract.properties.__dict__ else '') + (
-            f' {timestamp:%Y-%m-%d %H:%M:%S} qty: {self.qty} prc: {self.price:.6g}{fee}{commission} order: {self.order}') + (
+            f' {timestamp} qty: {self.qty} prc: {self.price:.6g}{fee}{commission} order: {self.order}') + (
             f' {self.properties.__dict__}' if self.properties.__dict__ else '')
     
+    def to_row(self) -> tuple[str, np.datetime64, float, float, float, float, float]:
+        '''Returns symbol, timestamp, qty, price, fee, commission and scaled qty for storing this trade in a TradeTable'''
+        return (self.contract.symbol, self.timestamp, self.qty, self.price, self.fee, self.commission, self.scaled_qty)
+    
 
-@dataclass
+@dataclass(slots=True)
 class RoundTripTrade:
     contract: Contract
     entry_order: Order
     exit_order: Order
     entry_timestamp: np.datetime64
     exit_timestamp: np.datetime64
-    qty: int
+    qty: float
     entry_price: float
     exit_price: float
-    entry_reason: str | None
-    exit_reason: str | None
+    entry_reason: ReasonCode | str | None
+    exit_reason: ReasonCode | str | None
     entry_commission: float
     exit_commission: float
     entry_properties: SimpleNamespace | None
     exit_properties: SimpleNamespace | None
     net_pnl: float
+
+
+class _ContractIds:
+    '''Maps contracts to small integer ids so that per contract values can be looked up with np.take'''
+    def __init__(self, contract_group: ContractGroup | None = None) -> None:
+        self.contracts: list[Contract] = []
+        self._ids: dict[str, int] = {}
+        if contract_group is not None:
+            for contract in contract_group.contracts_by_symbol.values(): self.get_id(contract)
+
+    def get_id(self, contract: Contract) -> int:
+        contract_id = self._ids.get(contract.symbol)
+        if contract_id is None:
+            contract_id = len(self.contracts)
+            self._ids[contract.symbol] = contract_id
+            self.contracts.append(contract)
+        return contract_id
+
+
+class TradeTable:
+    '''
+    Stores trades as parallel numpy arrays instead of a list of Trade objects.  Add trades using append and then call
+    finalize to convert them to numpy arrays.  Contracts are stored in the contracts list and referred to by their index in
+    that list in the contract_id column.
+
+    >>> Contract.clear()
+    >>> ContractGroup.clear()
+    >>> es = ContractGroup.create('ES')
+    >>> esh9 = Contract.create('ESH9', contract_group=es, multiplier=50)
+    >>> esm9 = Contract.create('ESM9', contract_group=es, multiplier=50)
+    >>> order = MarketOrder(contract=esh9, timestamp=np.datetime64('2019-01-01T09:30'), qty=2)
+    >>> table = TradeTable()
+    >>> table.append(Trade(esh9, order, np.datetime64('2019-01-01T09:31'), 2, 2500., commission=4.))
+    >>> table.append(Trade(esm9, order, np.datetime64('2019-01-01T09:32'), -1, 2510., commission=2.))
+    >>> table.finalize()
+    >>> print([contract.symbol for contract in table.contracts], table.contract_id)
+    ['ESH9', 'ESM9'] [0 1]
+    >>> prices = np.array([2505., 2505.])
+    >>> print(table.gross_pnl(prices), table.net_pnl(prices), table.commission_total())
+    750.0 744.0 6.0
+    '''
+    def __init__(self, contract_group: ContractGroup | None = None) -> None:
+        '''
+        Args:
+            contract_group: If set, contract ids are assigned to the contracts in this group up front, in the order 
+                they were added to the group.  Contracts not in the group get ids as their trades are appended.  Default None
+        '''
+        self._contract_ids = _ContractIds(contract_group)
+        self.contracts = self._contract_ids.contracts
+        self._columns: tuple[list, ...] = ([], [], [], [], [], [], [])
+        self.finalize()
+
+    def append(self, trade: Trade) -> None:
+        _, timestamp, qty, price, fee, commission, scaled_qty = trade.to_row()
+        timestamps, qtys, prices, fees, commissions, scaled_qtys, contract_ids = self._columns
+        timestamps.append(timestamp)
+        qtys.append(qty)
+        prices.append(price)
+        fees.append(fee)
+        commissions.append(commission)
+        scaled_qtys.append(scaled_qty)
+        contract_ids.append(self._contract_ids.get_id(trade.contract))
+
+    def finalize(self) -> None:
+        '''Converts trades appended so far to numpy arrays'''
+        timestamps, qtys, prices, fees, commissions, scaled_qtys, contract_ids = self._columns
+        self.timestamp = np.array(timestamps, dtype='M8[ns]')
+        self.qty = np.array(qtys, dtype=np.float64)
+        self.price = np.array(prices, dtype=np.float64)
+        self.fee = np.array(fees, dtype=np.float64)
+        self.commission = np.array(commissions, dtype=np.float64)
+        self.scaled_qty = np.array(scaled_qtys, dtype=np.float64)
+        self.contract_id = np.array(contract_ids, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+    def gross_pnl(self, prices: np.ndarray) -> float:
+        '''
+        Args:
+            prices: Current price of each contract, indexed by contract id
+        '''
+        prices = np.asarray(prices, dtype=np.float64)
+        return float(np.sum(self.scaled_qty * (np.take(prices, self.contract_id) - self.price)))
+
+    def net_pnl(self, prices: np.ndarray) -> float:
+        '''Gross pnl less fees and commissions'''
+        return self.gross_pnl(prices) - float(np.sum(self.fee)) - self.commission_total()
+
+    def commission_total(self) -> float:
+        return float(np.sum(self.commission))
+
+
+# Layout of a round trip trade in a RoundTripTradeTable.  Reason ids are ReasonCode values, or _OTHER_REASON_ID for
+# reason codes that are not ReasonCode members
+RT_DTYPE = np.dtype([('entry_timestamp', 'datetime64[ns]'), 
+                     ('exit_timestamp', 'datetime64[ns]'), 
+                     ('qty', 'f8'), 
+                     ('entry_price', 'f8'), 
+                     ('exit_price', 'f8'), 
+                     ('entry_commission', 'f8'), 
+                     ('exit_commission', 'f8'), 
+                     ('net_pnl', 'f8'), 
+                     ('contract_id', 'i4'), 
+                     ('entry_reason_id', 'u1'), 
+                     ('exit_reason_id', 'u1')])
+
+# Reason ids are stored as u1 so once 255 distinct reasons have been seen, further custom reasons share this id
+_OTHER_REASON_ID = 255
+
+
+class _ReasonIds:
+    '''
+    Maps reason codes and custom reason strings to small integer ids.  ReasonCode members keep their value, 0 means no reason 
+    and custom strings get the next free id, so reasons[id] is the text of the reason
+    '''
+    def __init__(self) -> None:
+        self.reasons: list[str] = [''] + list(_REASON_CODE_NAMES)
+        self._ids: dict[str, int] = {name: i for i, name in enumerate(self.reasons)}
+
+    def get_id(self, reason: ReasonCode | str | None) -> int:
+        if reason is None: return 0
+        if isinstance(reason, ReasonCode): return int(reason)
+        reason_id = self._ids.get(reason)
+        if reason_id is None:
+            if len(self.reasons) >= _OTHER_REASON_ID: return _OTHER_REASON_ID
+            reason_id = len(self.reasons)
+            self._ids[reason] = reason_id
+            self.reasons.append(reason)
+        return reason_id
+
+
+class RoundTripTradeTable:
+    '''
+    Stores round trip trades in a numpy structured array with dtype RT_DTYPE.  Add round trip trades using append and then 
+    call finalize to build the array.  Each field is also available as an attribute, e.g. table.net_pnl, which is a view into the array.
+    Orders and properties are not stored unless keep_objects is set, in which case they are kept in parallel object arrays.
+    Entry and exit reasons are stored as ids, with the reason text in table.reasons
+
+    >>> Contract.clear()
+    >>> ContractGroup.clear()
+    >>> ibm = Contract.create('IBM', contract_group=ContractGroup.create('IBM'))
+    >>> entry_order = MarketOrder(contract=ibm, timestamp=np.datetime64('2023-01-03T09:30'), qty=10, reason_code=ReasonCode.ENTER_LONG)
+    >>> exit_order = MarketOrder(contract=ibm, timestamp=np.datetime64('2023-01-03T10:30'), qty=-10, reason_code='stop loss')
+    >>> table = RoundTripTradeTable()
+    >>> table.append(RoundTripTrade(ibm, entry_order, exit_order, entry_order.timestamp, exit_order.timestamp, 10, 140., 138.5,
+    ...                             entry_order.reason_code, exit_order.reason_code, 1., 1., None, None, -17.))
+    >>> table.finalize()
+    >>> print(len(table), table.net_pnl_total(), table.commission_total(), table.entry_reason_id, table.exit_reason_id)
+    1 -17.0 2.0 [1] [8]
+    >>> df = table.to_dataframe()
+    >>> print(df.symbol.tolist(), df.qty.tolist(), df.net_pnl.tolist(), df.entry_reason.tolist(), df.exit_reason.tolist())
+    ['IBM'] [10.0] [-17.0] ['enter long'] ['stop loss']
+    '''
+    def __init__(self, contract_group: ContractGroup | None = None, keep_objects: bool = False) -> None:
+        '''
+        Args:
+            contract_group: If set, contract ids are assigned to the contracts in this group up front.  Default None
+            keep_objects: If set, also store entry and exit orders and properties.  Default False
+        '''
+        self._contract_ids = _ContractIds(contract_group)
+        self.contracts = self._contract_ids.contracts
+        self._reason_ids = _ReasonIds()
+        self.reasons = self._reason_ids.reasons
+        self.keep_objects = keep_objects
+        self._rows: list[tuple] = []
+        self._objects: list[tuple] = []
+        self.finalize()
+
+    def append(self, rt: RoundTripTrade) -> None:
+        self._rows.append((rt.entry_timestamp, rt.exit_timestamp, rt.qty, rt.entry_price, rt.exit_price, 
+                           rt.entry_commission, rt.exit_commission, rt.net_pnl, self._contract_ids.get_id(rt.contract),
+                           self._reason_ids.get_id(rt.entry_reason), self._reason_ids.get_id(rt.exit_reason)))
+        if self.keep_objects:
+            self._objects.append((rt.entry_order, rt.exit_order, rt.entry_properties, rt.exit_properties))
+
+    def finalize(self) -> None:
+        '''Builds the structured array from round trip trades appended so far'''
+        self._arr = np.array(self._rows, dtype=RT_DTYPE)
+        for name in RT_DTYPE.names:  # type: ignore
+            setattr(self, name, self._arr[name])
+        if self.keep_objects:
+            for i, name in enumerate(['entry_order', 'exit_order', 'entry_properties', 'exit_properties']):
+                column = np.empty(len(self._objects), dtype=object)
+                column[:] = [objects[i] for objects in self._objects]
+                setattr(self, name, column)
+
+    def __len__(self) -> int:
+        return len(self._arr)
+
+    def net_pnl_total(self) -> float:
+        return float(np.sum(self._arr['net_pnl']))
+
+    def commission_total(self) -> float:
+        return float(np.sum(self._arr['entry_commission']) + np.sum(self._arr['exit_commission']))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        '''Returns a dataframe with a column for each field in RT_DTYPE plus the contract symbol and entry and exit reason text'''
+        import pandas as pd
+        df = pd.DataFrame(self._arr)
+        symbols = np.array([contract.symbol for contract in self.contracts], dtype=object)
+        df.insert(0, 'symbol', symbols[self._arr['contract_id']])
+        reasons = np.full(_OTHER_REASON_ID + 1, 'other', dtype=object)
+        reasons[:len(self.reasons)] = self.reasons
+        df['entry_reason'] = reasons[self._arr['entry_reason_id']]
+        df['exit_reason'] = reasons[self._arr['exit_reason_id']]
+        return df
     
     
 if __name__ == "__main__":
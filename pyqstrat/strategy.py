@@ -654,8 +654,8 @@ class Strategy:
         orders = self.orders(contract_group, start_date, end_date)
         order_records = [(order.contract.symbol if order.contract else '',
                           type(order).__name__, order.timestamp, order.qty, 
-                          order.reason_code, 
-                          (str(order.properties.__dict__) if order.properties.__dict__ else ''),
+                          str(order.reason_code), 
+                          (str(order.properties.__dict__) if order.properties is not None and order.properties.__dict__ else ''),
                           (str(order.contract.properties.__dict__) 
                            if order.contract and order.contract.properties.__dict__ else '')) for order in orders]
         df_orders = pd.DataFrame.from_records(order_records,
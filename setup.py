@@ -58,6 +58,18 @@ if __name__ == '__main__':
                                     extra_compile_args=cython_extra_compile_args,
                                     define_macros=[('NPY_NO_DEPRECATED_API', 'NPY_1_7_API_VERSION')])
     compute_pnl_module = cythonize([_compute_pnl_module], compiler_directives={'language_level' : "3"})[0]
+
+    ext_modules = [io_module, options_module, compute_pnl_module]
+
+    # Ahead of time compile the numba price kernels if numba is installed.  Otherwise pyqstrat falls back to jit or pure python
+    try:
+        import importlib.util
+        _spec = importlib.util.spec_from_file_location('pyqstrat._price_kernels_aot', 'pyqstrat/_price_kernels_aot.py')
+        _price_kernels_aot = importlib.util.module_from_spec(_spec)
+        _spec.loader.exec_module(_price_kernels_aot)
+        ext_modules.append(_price_kernels_aot.make_cc().distutils_extension())
+    except ImportError:
+        pass
     
     with open('version.txt', 'r') as f:
         version = f.read().strip()
@@ -70,7 +82,7 @@ if __name__ == '__main__':
         
     setup(name='pyqstrat',
           version=version,
-          ext_modules = [io_module, options_module, compute_pnl_module],
+          ext_modules = ext_modules,
           author_email='abbasi.sal@gmail.com',
           url='http://github.com/abbass2/pyqstrat/',
           license='BSD',